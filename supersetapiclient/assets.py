@@ -1,9 +1,14 @@
 """Assets."""
-import json
+try:
+    from functools import cached_property
+except ImportError:  # pragma: no cover
+    # Python<3.8
+    from cached_property import cached_property
+
 from pathlib import Path
 from typing import Union
 
-from supersetapiclient.base import raise_for_status
+from supersetapiclient.base import export_zip, json_dumps, raise_for_status
 
 
 class Assets:
@@ -12,31 +17,29 @@ class Assets:
     def __init__(self, client):
         self.client = client
 
-    @property
+    @cached_property
     def base_url(self):
         """Base url for these objects."""
         return self.client.join_urls(self.client.base_url, self.endpoint)
 
-    @property
+    @cached_property
     def import_url(self):
         return self.client.join_urls(self.base_url, "import/")
 
-    @property
+    @cached_property
     def export_url(self):
         return self.client.join_urls(self.base_url, "export/")
 
     def export(self, path: Union[Path, str]) -> None:
         """Export object into an importable file"""
-        response = self.client.get(self.export_url)
-        raise_for_status(response)
+        with self.client.get(self.export_url, stream=True) as response:
+            raise_for_status(response)
 
-        content_type = response.headers["content-type"].strip()
-        if content_type.startswith("application/zip"):
-            data = response.content
-            with open(path, "wb") as f:
-                f.write(data)
-            return
-        raise ValueError(f"Unknown content type {content_type}")
+            content_type = response.headers["content-type"].strip()
+            if content_type.startswith("application/zip"):
+                export_zip(response, path)
+                return
+            raise ValueError(f"Unknown content type {content_type}")
 
     def import_file(self, file_path, passwords=None) -> bool:
         """Import a file on remote.
@@ -55,7 +58,7 @@ class Assets:
 
         files = {
             "bundle": (file_path.name, open(file_path.name, "rb"), f"application/{file_ext}"),
-            "passwords": json.dumps(passwords),
+            "passwords": json_dumps(passwords),
         }
         response = self.client.post(self.import_url, files=files)
         raise_for_status(response)
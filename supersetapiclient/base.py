@@ -1,6 +1,7 @@
 """Base classes."""
 import dataclasses
 import logging
+import threading
 
 try:
     from functools import cached_property
@@ -9,55 +10,163 @@ except ImportError:  # pragma: no cover
     from cached_property import cached_property
 
 import json
-import os.path
-from pathlib import Path
+import math
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path, PurePath
 from typing import List, Union
 
 import yaml
 from requests import HTTPError
 
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    # PyYAML built without libyaml
+    from yaml import SafeDumper, SafeLoader
+
+try:
+    import orjson
+except ImportError:
+    # orjson is an optional speedup
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    # pysimdjson is an optional speedup
+    simdjson = None
+
 from supersetapiclient.exceptions import BadRequestError, ComplexBadRequestError, MultipleFound, NotFound
 
 logger = logging.getLogger(__name__)
 
 
 def json_field():
-    return dataclasses.field(default=None, repr=False)
+    # A default_factory keeps dataclasses from setting a class attribute that
+    # would shadow Object.__getattr__, which decodes JSON fields lazily.
+    return dataclasses.field(default_factory=dict, repr=False)
 
 
 def default_string():
     return dataclasses.field(default="", repr=False)
 
 
+if orjson is not None:
+
+    def json_dumps(obj) -> str:
+        """Serialize obj to a JSON formatted str."""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    json_loads = orjson.loads
+else:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
+# simdjson parsers are not thread-safe and can only be reused once all
+# documents they produced are released, so keep one per thread.
+_simdjson = threading.local()
+
+
+def json_response(response):
+    """Decode the JSON body of a response."""
+    if simdjson is None:
+        return response.json()
+    parser = getattr(_simdjson, "parser", None)
+    if parser is None:
+        parser = _simdjson.parser = simdjson.Parser()
+    try:
+        doc = parser.parse(response.content)
+    except ValueError:
+        # Let requests decode it, or raise its JSONDecodeError like without simdjson
+        return response.json()
+    # Materialize the document before the parser gets reused
+    if isinstance(doc, simdjson.Object):
+        return doc.as_dict()
+    if isinstance(doc, simdjson.Array):
+        return doc.as_list()
+    return doc
+
+
 def raise_for_status(response):
+    if response.status_code < 400:
+        # Nothing to raise on the happy path
+        return
     try:
         response.raise_for_status()
     except HTTPError as e:
         # Attempt to propagate the server error message
         try:
-            error_msg = response.json()["message"]
+            error_msg = json_response(response)["message"]
         except Exception:
             try:
-                errors = response.json()["errors"]
+                errors = json_response(response)["errors"]
             except Exception:
                 raise e
             raise ComplexBadRequestError(*e.args, request=e.request, response=e.response, errors=errors) from None
         raise BadRequestError(*e.args, request=e.request, response=e.response, message=error_msg) from None
 
 
+def _export_yaml(response, path: Union[Path, str]) -> None:
+    # Superset 1.x
+    # Parse the bytes: response.text would run charset detection over the
+    # whole body when the server sends no charset.
+    data = yaml.load(response.content, Loader=SafeLoader)
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.dump(data, f, Dumper=SafeDumper, default_flow_style=False)
+
+
+def _export_json(response, path: Union[Path, str]) -> None:  # pragma: no cover
+    # Superset 1.x
+    data = json_response(response)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+def export_zip(response, path: Union[Path, str]) -> None:
+    """Write a ZIP export to path in chunks instead of buffering it."""
+    with open(path, "wb") as f:
+        for chunk in response.iter_content(1 << 20):
+            f.write(chunk)
+
+
+# Export writers by MIME type
+_EXPORT_WRITERS = {
+    "application/text": _export_yaml,
+    "application/json": _export_json,
+    "application/zip": export_zip,
+}
+
+
 class Object:
+    """Base class for API objects.
+
+    Subclasses are plain dataclasses and keep an instance ``__dict__``:
+    ``_parent`` is attached after construction, JSON_FIELDS are decoded into it
+    on first access and ``dataclass(slots=True)`` requires Python 3.10.
+    """
+
     _parent = None
     JSON_FIELDS = []
+    _JSON_FIELDS_SET = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._JSON_FIELDS_SET = frozenset(cls.JSON_FIELDS)
 
     @classmethod
+    @lru_cache(maxsize=None)
     def fields(cls):
         """Get field names."""
         return dataclasses.fields(cls)
 
     @classmethod
+    @lru_cache(maxsize=None)
     def field_names(cls):
         """Get field names."""
-        return {f.name for f in cls.fields()}
+        return frozenset(f.name for f in cls.fields())
 
     @classmethod
     def from_json(cls, json: dict):
@@ -69,24 +178,52 @@ class Object:
         Returns:
             Object: return the related object
         """
-        field_names = cls.field_names()
-        return cls(**{k: v for k, v in json.items() if k in field_names})
+        return cls(**{k: json[k] for k in json.keys() & cls.field_names()})
 
     def to_json(self, columns):
         o = {}
+        raw_json = self.__dict__.get("_raw_json", {})
         for c in columns:
+            if c in raw_json and c not in self.__dict__:
+                # JSON field that was never decoded, send it back as is
+                o[c] = raw_json[c]
+                continue
             if not hasattr(self, c):
                 # Column that is not implemented yet
                 continue
             value = getattr(self, c)
-            if c in self.JSON_FIELDS:
-                value = json.dumps(value)
+            if c in self._JSON_FIELDS_SET:
+                value = json_dumps(value)
             o[c] = value
         return o
 
     def __post_init__(self):
         for f in self.JSON_FIELDS:
-            setattr(self, f, json.loads(getattr(self, f) or "{}"))
+            self._set_json_field(f, getattr(self, f))
+
+    def __getattr__(self, name):
+        # Only called for missing attributes: decode pending JSON fields
+        raw_json = self.__dict__.get("_raw_json")
+        if not raw_json or name not in raw_json:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        # The encoded value stays in _raw_json, which may be shared with copies;
+        # the decoded value in __dict__ takes precedence from now on.
+        value = json_loads(raw_json[name])
+        setattr(self, name, value)
+        return value
+
+    def _set_json_field(self, name, value) -> None:
+        """Set a JSON field, deferring decoding of encoded values to first access."""
+        if value is not None and not isinstance(value, str):
+            # Already decoded
+            setattr(self, name, value)
+        elif hasattr(type(self), name):
+            # A class attribute would shadow __getattr__, decode right away
+            setattr(self, name, json_loads(value or "{}"))
+        else:
+            self.__dict__.pop(name, None)
+            # Rebind rather than update, copies may share the mapping
+            self._raw_json = {**self.__dict__.get("_raw_json", {}), name: value or "{}"}
 
     @property
     def base_url(self) -> str:
@@ -98,17 +235,15 @@ class Object:
 
     def fetch(self) -> None:
         """Fetch additional object information."""
-        field_names = self.field_names()
-
         client = self._parent.client
         response = client.get(self.base_url)
-        o = response.json().get("result")
-        for k, v in o.items():
-            if k in field_names:
-                if k in self.JSON_FIELDS:
-                    setattr(self, k, json.loads(v or "{}"))
-                else:
-                    setattr(self, k, v)
+        o = json_response(response).get("result")
+        for k in o.keys() & self.field_names():
+            v = o[k]
+            if k in self._JSON_FIELDS_SET:
+                self._set_json_field(k, v)
+            else:
+                setattr(self, k, v)
 
     def save(self) -> None:
         """Save object information."""
@@ -125,6 +260,7 @@ class ObjectFactories:
     base_object: Object = None
 
     _INFO_QUERY = {"keys": ["add_columns", "edit_columns"]}
+    _JSON_HEADERS = {"Accept": "application/json"}
 
     def __init__(self, client):
         """Create a new Dashboards endpoint.
@@ -137,42 +273,42 @@ class ObjectFactories:
     @cached_property
     def _infos(self):
         # Get infos
-        response = self.client.get(self.info_url, params={"q": json.dumps(self._INFO_QUERY)})
+        response = self.client.get(self.info_url, params={"q": json_dumps(self._INFO_QUERY)}, headers=self._JSON_HEADERS)
 
         raise_for_status(response)
-        return response.json()
+        return json_response(response)
 
-    @property
+    @cached_property
     def add_columns(self):
-        return [e.get("name") for e in self._infos.get("add_columns", [])]
+        return list(map(itemgetter("name"), self._infos.get("add_columns", [])))
 
-    @property
+    @cached_property
     def edit_columns(self):
-        return [e.get("name") for e in self._infos.get("edit_columns", [])]
+        return list(map(itemgetter("name"), self._infos.get("edit_columns", [])))
 
-    @property
+    @cached_property
     def base_url(self):
         """Base url for these objects."""
         return self.client.join_urls(self.client.base_url, self.endpoint)
 
-    @property
+    @cached_property
     def info_url(self):
         return self.client.join_urls(self.base_url, "_info")
 
-    @property
+    @cached_property
     def import_url(self):
         return self.client.join_urls(self.base_url, "import/")
 
-    @property
+    @cached_property
     def export_url(self):
         return self.client.join_urls(self.base_url, "export/")
 
     def get(self, id: int):
         """Get an object by id."""
         url = self.client.join_urls(self.base_url, id)
-        response = self.client.get(url)
+        response = self.client.get(url, headers=self._JSON_HEADERS)
         raise_for_status(response)
-        response = response.json()
+        response = json_response(response)
 
         object_json = response.get("result")
         object_json["id"] = id
@@ -181,38 +317,71 @@ class ObjectFactories:
 
         return object
 
-    def find(self, page_size: int = 100, page: int = 0, **kwargs):
-        """Find and get objects from api."""
-        # Get response
+    def _find_page(self, page_size: int, page: int, filters: dict) -> dict:
+        """Get one page of raw results from api."""
         query = {
             "page_size": page_size,
             "page": page,
-            "filters": [{"col": k, "opr": "eq", "value": v} for k, v in kwargs.items()],
+            "filters": [{"col": k, "opr": "eq", "value": v} for k, v in filters.items()],
         }
 
-        params = {"q": json.dumps(query)}
+        params = {"q": json_dumps(query)}
 
-        response = self.client.get(self.base_url, params=params)
+        response = self.client.get(self.base_url, params=params, headers=self._JSON_HEADERS)
         raise_for_status(response)
-        response = response.json()
+        return json_response(response)
 
-        objects = []
-        for r in response.get("result"):
-            o = self.base_object.from_json(r)
+    def _from_results(self, results) -> list:
+        from_json = self.base_object.from_json
+        objects = [from_json(r) for r in results]
+        for o in objects:
             o._parent = self
-            objects.append(o)
 
         return objects
 
+    def find(self, page_size: int = 100, page: int = 0, **kwargs):
+        """Find and get objects from api."""
+        response = self._find_page(page_size, page, kwargs)
+        return self._from_results(response.get("result", ()))
+
+    def find_all(self, page_size: int = 100, max_workers: int = 4, **kwargs):
+        """Find and get all matching objects from api.
+
+        The first page tells how many objects match, the remaining pages are
+        then fetched concurrently over the client's session. An expired token
+        is refreshed by the first request; a token that expires while the
+        remaining pages are in flight is refreshed by every worker at once.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        response = self._find_page(page_size, 0, kwargs)
+        results = list(response.get("result", ()))
+        count = response.get("count", 0)
+        if 0 < len(results) < min(page_size, count):
+            # The server caps page_size (FAB_API_MAX_PAGE_SIZE), page with the size it used
+            page_size = len(results)
+        pages = math.ceil(count / page_size)
+
+        if pages > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                responses = executor.map(lambda page: self._find_page(page_size, page, kwargs), range(1, pages))
+                for r in responses:
+                    results.extend(r.get("result", ()))
+
+        return self._from_results(results)
+
     def count(self):
         """Count objects."""
-        response = self.client.get(self.base_url)
+        response = self.client.get(self.base_url, headers=self._JSON_HEADERS)
         raise_for_status(response)
-        return response.json()["count"]
+        return json_response(response)["count"]
 
     def find_one(self, **kwargs):
         """Find only object or raise an Exception."""
-        objects = self.find(**kwargs)
+        # Two results are enough to tell a unique match from multiple ones, a
+        # caller supplied page_size is ignored
+        kwargs.pop("page_size", None)
+        objects = self.find(page_size=2, **kwargs)
         if len(objects) == 0:
             raise NotFound(f"No {self.base_object.__name__} found")
         if len(objects) > 1:
@@ -225,43 +394,27 @@ class ObjectFactories:
         o = obj.to_json(columns=self.add_columns)
         response = self.client.post(self.base_url, json=o)
         raise_for_status(response)
-        obj.id = response.json().get("id")
+        obj.id = json_response(response).get("id")
         obj._parent = self
         return obj.id
 
     def export(self, ids: List[int], path: Union[Path, str]) -> None:
         """Export object into an importable file"""
-        ids_array = ",".join([str(i) for i in ids])
-        response = self.client.get(self.export_url, params={"q": f"[{ids_array}]"})
-
-        raise_for_status(response)
+        with self.client.get(self.export_url, params={"q": json_dumps(list(ids))}, stream=True) as response:
+            raise_for_status(response)
 
-        content_type = response.headers["content-type"].strip()
-        if content_type.startswith("application/text"):  # pragma: no cover
-            # Superset 1.x
-            data = yaml.load(response.text, Loader=yaml.FullLoader)
-            with open(path, "w", encoding="utf-8") as f:
-                yaml.dump(data, f, default_flow_style=False)
-            return
-        if content_type.startswith("application/json"):  # pragma: no cover
-            # Superset 1.x
-            data = response.json()
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-            return
-        if content_type.startswith("application/zip"):
-            data = response.content
-            with open(path, "wb") as f:
-                f.write(data)
-            return
-        raise ValueError(f"Unknown content type {content_type}")
+            content_type = response.headers["content-type"].strip()
+            writer = _EXPORT_WRITERS.get(content_type.split(";", 1)[0].strip())
+            if writer is None:
+                raise ValueError(f"Unknown content type {content_type}")
+            writer(response, path)
 
     def delete(self, id: int) -> bool:
         """Delete a object on remote."""
         url = self.client.join_urls(self.base_url, id)
         response = self.client.delete(url)
         raise_for_status(response)
-        return response.json().get("message") == "OK"
+        return json_response(response).get("message") == "OK"
 
     def import_file(self, file_path, overwrite=False, passwords=None) -> dict:
         """Import a file on remote.
@@ -273,14 +426,15 @@ class ObjectFactories:
         databases/MyDatabase.yaml, the password should be provided in the
         following format: {"MyDatabase": "my_password"}
         """
-        data = {"overwrite": json.dumps(overwrite)}
-        passwords = {f"databases/{db}.yaml": pwd for db, pwd in (passwords or {}).items()}
-        file_name = os.path.split(file_path)[-1]
-        file_ext = os.path.splitext(file_name)[-1].lstrip(".").lower()
+        data = {"overwrite": "true" if overwrite else "false"}
+        passwords = json_dumps({f"databases/{db}.yaml": pwd for db, pwd in (passwords or {}).items()})
+        file_path = PurePath(file_path)
+        file_name = file_path.name
+        file_ext = file_path.suffix.lstrip(".").lower()
         with open(file_path, "rb") as f:
             files = {
                 "formData": (file_name, f, f"application/{file_ext}"),
-                "passwords": (None, json.dumps(passwords), None),
+                "passwords": (None, passwords, None),
             }
             response = self.client.post(
                 self.import_url,
@@ -291,4 +445,4 @@ class ObjectFactories:
         raise_for_status(response)
 
         # If import is successful, the following is returned: {'message': 'OK'}
-        return response.json().get("message") == "OK"
+        return json_response(response).get("message") == "OK"
@@ -1,8 +1,15 @@
 """Databases."""
 from dataclasses import dataclass
+
+try:
+    from functools import cached_property
+except ImportError:  # pragma: no cover
+    # Python<3.8
+    from cached_property import cached_property
+
 from typing import Optional
 
-from supersetapiclient.base import Object, ObjectFactories, default_string, json_field
+from supersetapiclient.base import Object, ObjectFactories, default_string, json_field, json_response
 
 
 @dataclass
@@ -48,7 +55,7 @@ class Databases(ObjectFactories):
     endpoint = "database/"
     base_object = Database
 
-    @property
+    @cached_property
     def test_connection_url(self):
         """Base url for these objects."""
         return self.client.join_urls(self.client.base_url, self.endpoint, "test_connection")
@@ -59,4 +66,4 @@ class Databases(ObjectFactories):
         connection_columns = ["database_name", "sqlalchemy_uri"]
         o = {c: getattr(obj, c) for c in connection_columns}
         response = self.client.post(url, json=o)
-        return response.json().get("message") == "OK"
+        return json_response(response).get("message") == "OK"
@@ -1,3 +1,5 @@
+import copy
+import dataclasses
 import json
 import random
 import string
@@ -6,7 +8,9 @@ import tempfile
 import pytest
 import requests
 import requests.exceptions
+import yaml
 
+from supersetapiclient.base import json_response
 from supersetapiclient.charts import Chart
 from supersetapiclient.client import SupersetClient, raise_for_status
 from supersetapiclient.dashboards import Dashboard
@@ -458,6 +462,20 @@ class TestEntities:
         with pytest.raises(MultipleFound):
             superset_api.dashboards.find_one(dashboard_title=title)
 
+    def test_find_all(self, superset_api):
+        title = random_str(8)
+        assert superset_api.dashboards.find_all(dashboard_title=title) == []
+
+        ids = []
+        for _ in range(5):
+            d = Dashboard(dashboard_title=title, published=True, slug=random_str(8))
+            ids.append(superset_api.dashboards.add(d))
+
+        # Spread the results over several pages
+        dashboards = superset_api.dashboards.find_all(page_size=2, dashboard_title=title)
+        assert sorted(d.id for d in dashboards) == sorted(ids)
+        assert all(d._parent is superset_api.dashboards for d in dashboards)
+
 
 class TestClient:
     def test_no_verify(self, superset_url):
@@ -522,7 +540,156 @@ class TestClient:
         assert exc_info.value.args[0] == "Unknown content type application/x"
 
 
+class TestObject:
+    def test_json_fields_lazy_decode(self, requests_mock, client):
+        url = client.join_urls(client.dashboards.base_url, 1)
+        json_metadata = '{"label_colors": {"label": "#fcba03"}}'
+        requests_mock.get(url, json={"result": {"dashboard_title": "X", "published": True, "json_metadata": json_metadata}})
+        d = client.dashboards.get(1)
+
+        # Not decoded until first accessed
+        assert "json_metadata" not in d.__dict__
+        assert d.colors == {"label": "#fcba03"}
+        assert "json_metadata" in d.__dict__
+
+        # Undecoded fields are sent back unchanged, decoded ones re-encoded
+        o = d.to_json(["json_metadata", "position_json"])
+        assert json.loads(o["json_metadata"]) == {"label_colors": {"label": "#fcba03"}}
+        assert o["position_json"] == "{}"
+        d = client.dashboards.get(1)
+        assert d.to_json(["json_metadata"]) == {"json_metadata": json_metadata}
+
+        # fetch resets fields that were already decoded
+        d.update_colors({"other": "#000000"})
+        d.fetch()
+        assert d.colors == {"label": "#fcba03"}
+
+    def test_json_fields_copy(self):
+        d = Dashboard(dashboard_title="X", published=True, json_metadata='{"label_colors": {"a": "#000000"}}')
+        c = copy.copy(d)
+        assert c.colors == {"a": "#000000"}
+        assert d.colors == {"a": "#000000"}
+
+        c = copy.copy(d)
+        c._set_json_field("json_metadata", "{}")
+        assert c.colors == {}
+        assert d.colors == {"a": "#000000"}
+
+    def test_json_fields_invalid(self):
+        d = Dashboard(dashboard_title="X", published=True, json_metadata="{invalid")
+        for _ in range(2):
+            # The encoded value is kept when decoding fails
+            with pytest.raises(ValueError):
+                d.json_metadata
+        d.json_metadata = {}
+        assert d.colors == {}
+
+    def test_json_fields_class_default(self):
+        @dataclasses.dataclass
+        class CustomChart(Chart):
+            JSON_FIELDS = ["params", "custom"]
+
+            custom: dict = None
+
+        # A class-level default would shadow lazy decoding, so the field is decoded eagerly
+        c = CustomChart(params='{"a": 1}', custom='{"b": 2}')
+        assert "params" not in c.__dict__
+        assert c.__dict__["custom"] == {"b": 2}
+        o = c.to_json(["params", "custom"])
+        assert o["params"] == '{"a": 1}'
+        assert json.loads(o["custom"]) == {"b": 2}
+
+    def test_own_post_init(self):
+        @dataclasses.dataclass
+        class CustomChart(Chart):
+            def __post_init__(self):
+                pass
+
+        c = CustomChart(slice_name="X")
+        assert c.to_json(["slice_name"]) == {"slice_name": "X", "dashboards": []}
+
+
+class TestFactories:
+    def test_find_all(self, requests_mock, client):
+        count, max_page_size = 11, 5
+
+        def result(request, context):
+            q = json.loads(request.qs["q"][0])  # requests_mock lowercases query strings
+            assert q["filters"] == [{"col": "dashboard_title", "opr": "eq", "value": "x"}]
+            # Like Flask-AppBuilder, silently cap the page size
+            page_size = min(q["page_size"], max_page_size)
+            ids = list(range(count))[q["page"] * page_size : (q["page"] + 1) * page_size]
+            return {"count": count, "result": [{"id": i, "dashboard_title": "X", "published": True} for i in ids]}
+
+        requests_mock.get(client.dashboards.base_url, json=result)
+
+        # Pages of 3, the last one only partially filled
+        dashboards = client.dashboards.find_all(page_size=3, dashboard_title="x")
+        assert [d.id for d in dashboards] == list(range(count))
+        assert all(d._parent is client.dashboards for d in dashboards)
+
+        # Page size capped by the server
+        assert [d.id for d in client.dashboards.find_all(page_size=20, dashboard_title="x")] == list(range(count))
+
+        # A single page
+        count = 4
+        assert [d.id for d in client.dashboards.find_all(page_size=20, dashboard_title="x")] == list(range(count))
+
+        with pytest.raises(ValueError):
+            client.dashboards.find_all(page_size=0)
+
+    def test_find_one(self, requests_mock, client):
+        requests_mock.get(
+            client.dashboards.base_url,
+            json={"count": 1, "result": [{"id": 1, "dashboard_title": "X", "published": True}]},
+        )
+        assert client.dashboards.find_one(page_size=100, dashboard_title="x").id == 1
+        assert json.loads(requests_mock.last_request.qs["q"][0])["page_size"] == 2
+
+
+class TestExport:
+    @pytest.fixture
+    def expired_token(self, requests_mock, client):
+        # The first request is rejected with an expired token, and replayed by token_refresher after a refresh
+        requests_mock.post(client.refresh_endpoint, json={"access_token": "new_access_token"})
+        expired = dict(status_code=401, content=json.dumps({"msg": "Token has expired"}).encode())
+
+        def mock_export(url, **kwargs):
+            requests_mock.get(url, [expired, dict(status_code=200, **kwargs)])
+
+        return mock_export
+
+    def test_export_zip_after_token_refresh(self, expired_token, client):
+        expired_token(client.databases.export_url, content=b"PK\x03\x04data", headers={"content-type": "application/zip"})
+        with tempfile.NamedTemporaryFile(suffix=".zip") as f:
+            client.databases.export([1], f.name)
+            assert f.read() == b"PK\x03\x04data"
+
+    def test_assets_export_after_token_refresh(self, expired_token, client):
+        expired_token(client.assets.export_url, content=b"PK\x03\x04data", headers={"content-type": "application/zip"})
+        with tempfile.NamedTemporaryFile(suffix=".zip") as f:
+            client.assets.export(f.name)
+            assert f.read() == b"PK\x03\x04data"
+
+    def test_export_yaml_after_token_refresh(self, expired_token, client):
+        # Superset 1.x
+        expired_token(client.databases.export_url, content="a: é\n".encode(), headers={"content-type": "application/text"})
+        with tempfile.NamedTemporaryFile(suffix=".yaml") as f:
+            client.databases.export([1], f.name)
+            assert yaml.safe_load(f) == {"a": "é"}
+
+
 class TestExceptions:
+    def test_json_response(self, requests_mock):
+        url = "https://example.com"
+
+        requests_mock.get(url, content=b"XXX")
+        with pytest.raises(requests.exceptions.JSONDecodeError):
+            json_response(requests.get(url))
+
+        requests_mock.get(url, content=json.dumps({"message": "é"}).encode("utf-16"))
+        assert json_response(requests.get(url)) == {"message": "é"}
+
     def test_raise_for_status(self, requests_mock):
         url = "https://example.com"
 